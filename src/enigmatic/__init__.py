@@ -1,7 +1,7 @@
 import abc
 from typing import Iterable
 import rich.console
-from attrs import define
+from attrs import define, field
 
 # Global alphabet used by this package:
 ALPHABET: tuple[str, ...] = tuple(chr(ord("A") + i) for i in range(26))
@@ -28,6 +28,12 @@ class Scrambler(abc.ABC):
 
     name: str = ""
 
+    _version: int = field(default=0, init=False, repr=False, eq=False)
+    """ Counts changes of the routing apart from the rotation, e.g. new cables or ring settings"""
+
+    def _changed(self, *_):
+        self._version += 1
+
     @abc.abstractmethod
     def route(self, letter: int) -> int:
         """Forward routing of a letter through the Scrambler"""
@@ -0,0 +1,199 @@
+"""Statistics of wheel orders over the whole key space
+https://de.wikipedia.org/wiki/Enigma_(Maschine)#Schl%C3%BCsselraum
+
+All start positions of a wheel order are analysed at once. The stepping model provides the successor of every rotor
+state, which forms a graph where each start state runs into a cycle. Periods, visited states, rotor position
+histograms and output distributions are derived from this graph and the rotor tables as numpy arrays.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Iterable
+
+import numpy as np
+import rich.console
+from attrs import define, field
+from rich.table import Table
+
+from enigmatic import ALPHABET
+from enigmatic.enigma import Enigma
+from enigmatic.rotor import RotorSpec
+
+M3_WHEEL_ORDERS: tuple[tuple[str, ...], ...] = tuple(
+    ("M3: ukw-b", *wheels) for wheels in itertools.permutations(["I", "II", "III", "IV", "V"], 3)
+)
+""" All 60 wheel orders of the Enigma M3 with reflector B, slow rotor first"""
+
+
+@define(frozen=True)
+class WheelOrderStatistics:
+    """Statistics for all start positions of a wheel order
+
+    Arrays indexed by the start state have one axis per dynamic rotor, slow rotor first. Arrays indexed by the cycle
+    refer to the cycle ids in `cycle`.
+    """
+
+    wheels: tuple[str, ...]
+
+    cycle: np.ndarray = field(eq=False, repr=False)
+    """ Id of the cycle each start state runs into"""
+
+    tail: np.ndarray = field(eq=False, repr=False)
+    """ Number of keystrokes from each start state until the cycle is reached"""
+
+    cycle_period: np.ndarray = field(eq=False, repr=False)
+    """ Length of each cycle"""
+
+    position_histogram: np.ndarray = field(eq=False, repr=False)
+    """ How often each rotor is in each position during one cycle. Shape: (cycles, dynamic rotors, 26)"""
+
+    output_distribution: np.ndarray = field(eq=False, repr=False)
+    """ Output letters during one cycle for constant input. Shape: (cycles, input letter, output letter)"""
+
+    @property
+    def period(self) -> np.ndarray:
+        """Period of the machine for each start state"""
+        return self.cycle_period[self.cycle]
+
+    @property
+    def visited(self) -> np.ndarray:
+        """Number of different states visited from each start state"""
+        return self.tail + self.period
+
+    @property
+    def states_on_cycles(self) -> int:
+        return int(self.cycle_period.sum())
+
+    # noinspection PyUnusedLocal
+    def __rich_console__(
+        self, console: rich.console.Console, options: rich.console.ConsoleOptions
+    ) -> rich.console.RenderResult:
+        table = Table(title=f"Wheel order: {' '.join(self.wheels)}")
+        table.add_column("Cycle")
+        table.add_column("Period")
+        table.add_column("Start states")
+        for i, period in enumerate(self.cycle_period):
+            table.add_row(str(i), str(period), str(np.count_nonzero(self.cycle == i)))
+
+        yield table
+
+
+def analyse(enigma: Enigma) -> WheelOrderStatistics:
+    """Analyse all start positions of the dynamic rotors of an enigma machine
+
+    Plugboard, ring settings, stator positions and the stepping model of the machine are used.
+    """
+    rotors = enigma.dynamic_rotors
+    shape = (len(ALPHABET),) * len(rotors)
+    successors = enigma.stepping.successors([x.spec.notch_numbers for x in rotors])
+
+    cycle, tail, cycle_period = _cycle_structure(successors)
+    n_cycles = len(cycle_period)
+
+    on_cycle = np.flatnonzero(tail == 0)
+    cycle_of_state = cycle[on_cycle]
+    positions = np.array(np.unravel_index(on_cycle, shape)).T
+
+    position_histogram = np.stack(
+        [
+            np.bincount(cycle_of_state * len(ALPHABET) + column, minlength=n_cycles * len(ALPHABET))
+            for column in positions.T
+        ]
+    ).reshape(len(rotors), n_cycles, len(ALPHABET))
+
+    permutations = state_permutations(enigma, positions)
+    letters = np.arange(len(ALPHABET))
+    index = (cycle_of_state[:, np.newaxis] * len(ALPHABET) + letters) * len(ALPHABET) + permutations
+    output_distribution = np.bincount(index.ravel(), minlength=n_cycles * len(ALPHABET) ** 2)
+
+    return WheelOrderStatistics(
+        wheels=tuple(x.spec.name for x in enigma.rotors),
+        cycle=cycle.reshape(shape),
+        tail=tail.reshape(shape),
+        cycle_period=cycle_period,
+        position_histogram=position_histogram.swapaxes(0, 1),
+        output_distribution=output_distribution.reshape(n_cycles, len(ALPHABET), len(ALPHABET)),
+    )
+
+
+def analyse_wheel_orders(
+    wheel_orders: Iterable[Iterable[str | RotorSpec]] = M3_WHEEL_ORDERS, **settings
+) -> list[WheelOrderStatistics]:
+    """Analyse many wheel orders. Settings are passed to Enigma.assemble, e.g. cables or ring_settings"""
+    return [analyse(Enigma.assemble(wheels, **settings)) for wheels in wheel_orders]
+
+
+def summary_table(statistics: Iterable[WheelOrderStatistics]) -> Table:
+    table = Table(title="Wheel orders")
+    table.add_column("Wheels")
+    table.add_column("Cycles")
+    table.add_column("Periods")
+    table.add_column("States on cycles")
+    table.add_column("Max. tail")
+
+    for stat in statistics:
+        periods = ", ".join(str(x) for x in sorted(set(stat.cycle_period.tolist())))
+        table.add_row(
+            " ".join(stat.wheels),
+            str(len(stat.cycle_period)),
+            periods,
+            str(stat.states_on_cycles),
+            str(stat.tail.max()),
+        )
+
+    return table
+
+
+def state_permutations(enigma: Enigma, positions: np.ndarray) -> np.ndarray:
+    """Permutation of the whole machine for many positions of the dynamic rotors
+
+    :param positions: array of shape (states, dynamic rotors), slow rotor first
+    :return: array of shape (states, 26) with the output letter for each input letter
+    """
+    positions = np.asarray(positions)
+    rotors = enigma.rotors
+    columns = iter(positions.T[:, :, np.newaxis])
+    rotor_positions = [next(columns) if x.spec.is_dynamic else x.position for x in rotors]
+    all_positions = range(len(ALPHABET))
+
+    plug_board = np.array([enigma.plug_board.route(x) for x in range(len(ALPHABET))])
+    current = np.broadcast_to(plug_board, (len(positions), len(ALPHABET)))
+
+    for rotor, position in zip(reversed(rotors), reversed(rotor_positions)):
+        current = rotor.route_table(all_positions)[position, current]
+
+    for rotor, position in zip(rotors[1:], rotor_positions[1:]):
+        current = rotor.route_table(all_positions, backward=True)[position, current]
+
+    return plug_board[current]
+
+
+def _cycle_structure(successors: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cycles of the graph given by the successor of each state
+
+    :return: cycle id of each state, distance of each state to its cycle, period of each cycle
+    """
+    n_states = len(successors)
+    steps = max(1, int(np.ceil(np.log2(n_states))))
+
+    # Pointer doubling: after the loop `jump` leads 2**steps states ahead, which is always on a cycle.
+    # `lowest` is the lowest state within these 2**steps states, which identifies the cycle
+    jump = successors
+    lowest = np.arange(n_states)
+    for _ in range(steps):
+        lowest = np.minimum(lowest, lowest[jump])
+        jump = jump[jump]
+
+    on_cycle = np.zeros(n_states, dtype=bool)
+    on_cycle[jump] = True
+
+    _, cycle = np.unique(lowest[jump], return_inverse=True)
+    cycle_period = np.bincount(cycle[on_cycle])
+
+    tail = np.where(on_cycle, 0, -1)
+    while (open_states := tail < 0).any():
+        ready = open_states & (tail[successors] >= 0)
+        tail[ready] = tail[successors[ready]] + 1
+
+    return cycle, tail, cycle_period
@@ -0,0 +1,155 @@
+"""Command line tool to encrypt or decrypt many messages with the same key sheet
+
+Example:
+    enigmatic key_sheet.json messages.jsonl -o results.jsonl
+
+The key sheet is a json object with the arguments of Enigma.assemble:
+    {"rotor_specs": ["ukw-c", "beta", "V", "VI", "VIII"], "cables": "AE BF CM DQ HU JN LX PR SZ VW",
+     "rotor_positions": "*CDSZ", "ring_settings": "*EPEL"}
+Other keys of the key sheet, e.g. a comment or date, are ignored.
+
+Messages are read from a jsonl stream (use "-" for stdin) with one object per line, e.g. {"id": "1", "text": "HELLO"}.
+Each message may override settings of the key sheet, typically the rotor_positions (message key).
+Alternatively a directory with one *.txt file per message can be given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+import rich.console
+
+from enigmatic.enigma import Enigma
+
+SETTINGS: tuple[str, ...] = ("rotor_specs", "cables", "rotor_positions", "ring_settings", "stepping")
+""" Arguments of Enigma.assemble which can be used in a key sheet or message"""
+
+
+def process_message(key_sheet: dict[str, Any], message: dict[str, Any]) -> dict[str, Any]:
+    """Encrypt or decrypt a single message. Settings of the message override the key sheet
+
+    Any failure is returned as an "error" of the message, so a single bad message never stops the batch.
+    """
+    result = {"id": message.get("id")}
+    if "error" in message:
+        return result | {"error": message["error"]}
+
+    try:
+        settings = key_sheet | {key: value for key, value in message.items() if key in SETTINGS}
+        enigma = Enigma.assemble(**settings)
+        result["output"] = enigma.write(message["text"])
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def read_messages(source: str) -> Iterator[dict[str, Any]]:
+    """Messages from a jsonl file, stdin ("-") or a directory with *.txt files"""
+    if source == "-":
+        yield from _read_jsonl(sys.stdin)
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(path.glob("*.txt")):
+            yield {"id": file.stem, "text": file.read_text()}
+    else:
+        with open(path, "r") as stream:
+            yield from _read_jsonl(stream)
+
+
+def _read_jsonl(stream: TextIO) -> Iterator[dict[str, Any]]:
+    """Invalid lines are passed on as messages with an "error" """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"id": None, "error": f"Invalid json in line {line_number}: {e}"}
+            continue
+
+        if isinstance(message, dict):
+            yield message
+        else:
+            yield {"id": None, "error": f"Line {line_number} is not a json object"}
+
+
+def bounded_map(executor: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """Like executor.map, but only `window` items are submitted at the same time. Results keep the order of the
+    items and the input is read lazily, so memory stays bounded for long streams"""
+    pending: deque[Future] = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="enigmatic", description="Encrypt or decrypt messages with an enigma machine")
+    parser.add_argument("key_sheet", help="json file with the settings of Enigma.assemble")
+    parser.add_argument("messages", help='jsonl file, "-" for stdin or a directory with *.txt files')
+    parser.add_argument("-o", "--output", help="jsonl file for the results (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument("--window", type=int, help="max. number of messages in progress (default: 4 * workers)")
+
+    settings = parser.add_argument_group("settings", "override the key sheet")
+    settings.add_argument("--rotor-specs", nargs="+", help="wheel specs, slow rotor first, e.g. ukw-b I II III")
+    settings.add_argument("--cables", help='plugboard cables, e.g. "AB DF ZK"')
+    settings.add_argument("--rotor-positions", help='slow rotor first, e.g. "*NAEM"')
+    settings.add_argument("--ring-settings", help='slow rotor first, e.g. "*ABCD"')
+    settings.add_argument("--stepping", help='stepping model, e.g. "ratchet" or "cog"')
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = _parse_args(argv)
+    console = rich.console.Console(stderr=True)
+
+    with open(args.key_sheet, "r") as stream:
+        key_sheet = {key: value for key, value in json.load(stream).items() if key in SETTINGS}
+    key_sheet |= {key: value for key in SETTINGS if (value := getattr(args, key)) is not None}
+
+    workers = max(1, args.workers or 1)
+    window = args.window or 4 * workers
+
+    n_messages = n_letters = n_errors = 0
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        output = stack.enter_context(open(args.output, "w")) if args.output else sys.stdout
+        executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+
+        results = bounded_map(executor, partial(process_message, key_sheet), read_messages(args.messages), window)
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+            n_messages += 1
+            n_letters += len(result.get("output", ""))
+            n_errors += "error" in result
+
+    seconds = time.perf_counter() - start
+    console.print(
+        f"{n_messages} messages ({n_errors} errors), {n_letters} letters in {seconds:.2f} s: "
+        f"{n_messages / seconds:.1f} messages/s, {n_letters / seconds:.0f} letters/s"
+    )
+
+    return 1 if n_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
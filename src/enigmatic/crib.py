@@ -0,0 +1,97 @@
+"""Crib placement
+https://en.wikipedia.org/wiki/Cryptanalysis_of_the_Enigma#Crib-based_decryption
+
+The enigma never encrypts a letter to itself. A crib (guessed plaintext) can therefore only be placed at offsets of the
+ciphertext, where no letter of the crib matches the ciphertext letter at the same position.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+from attrs import define
+
+from enigmatic import ALPHABET
+
+
+@define(frozen=True)
+class CribPlacement:
+    crib: str
+    offset: int
+
+    distance: int = 0
+    """ Distance to the nearest expected offset, 0 if no offsets are expected"""
+
+
+def admissible_offsets(ciphertext: str | np.ndarray, crib: str | np.ndarray) -> np.ndarray:
+    """All offsets where the crib can be placed without a letter being encrypted to itself
+
+    >>> admissible_offsets("ABCDE", "BA").tolist()
+    [0, 2, 3]
+    """
+    ciphertext = _to_numbers(ciphertext)
+    crib = _to_numbers(crib)
+
+    n_offsets = len(ciphertext) - len(crib) + 1
+    if n_offsets <= 0 or len(crib) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    # One comparison of the whole ciphertext per crib letter, instead of a loop over the offsets
+    clash = np.zeros(n_offsets, dtype=bool)
+    for i, letter in enumerate(crib):
+        clash |= ciphertext[i : i + n_offsets] == letter
+
+    return np.flatnonzero(~clash)
+
+
+def crib_placements(
+    ciphertext: str, cribs: str | Iterable[str], expected_offsets: Iterable[int] = ()
+) -> list[CribPlacement]:
+    """Admissible placements of one or many cribs, best first
+
+    Long cribs are ranked first. Placements close to an expected offset are preferred, e.g. a greeting at the start
+    (0) or a signature at the end of the message (-1: the crib ends with the last letter of the ciphertext).
+
+    >>> crib_placements("ABCDE", "BA", expected_offsets=[-1])
+    [CribPlacement(crib='BA', offset=3, distance=0),
+     CribPlacement(crib='BA', offset=2, distance=1),
+     CribPlacement(crib='BA', offset=0, distance=3)]
+    """
+    ciphertext_numbers = _to_numbers(ciphertext)
+    expected_offsets = tuple(expected_offsets)
+    if isinstance(cribs, str):
+        cribs = [cribs]
+
+    placements = []
+    for crib in cribs:
+        crib = _normalize(crib)
+        offsets = admissible_offsets(ciphertext_numbers, crib)
+        distance = _distance(offsets, expected_offsets, len(ciphertext_numbers), len(crib))
+
+        placements += [CribPlacement(crib, o, d) for o, d in zip(offsets.tolist(), distance.tolist())]
+
+    return sorted(placements, key=lambda x: (-len(x.crib), x.distance, x.offset))
+
+
+def _distance(offsets: np.ndarray, expected_offsets: Iterable[int], text_length: int, crib_length: int) -> np.ndarray:
+    expected = np.array([x if x >= 0 else text_length + x - crib_length + 1 for x in expected_offsets], dtype=np.intp)
+    if len(expected) == 0:
+        return np.zeros(len(offsets), dtype=np.intp)
+
+    return np.abs(offsets[:, np.newaxis] - expected).min(axis=1)
+
+
+def _normalize(text: str) -> str:
+    return text.upper().replace(" ", "").replace("\n", "")
+
+
+def _to_numbers(text: str | np.ndarray) -> np.ndarray:
+    if isinstance(text, np.ndarray):
+        return text
+
+    numbers = np.frombuffer(_normalize(text).encode("ascii", errors="replace"), dtype=np.uint8) - ord(ALPHABET[0])
+    if (numbers >= len(ALPHABET)).any():
+        raise ValueError("Invalid letters in text")
+
+    return numbers
@@ -4,21 +4,47 @@ import numpy as np
 from typing import Callable, Iterable
 from collections import deque
 
-from enigmatic import ALPHABET, _letters_to_numbers, _num2letter
+from enigmatic import ALPHABET, Scrambler, _letters_to_numbers, _num2letter
+from enigmatic.fusion import FusedScrambler
 from enigmatic.plugboard import PlugBoard
 from enigmatic.rotor import RotorSpec, Rotor, WHEEL_SPECS
+from enigmatic.stepping import SteppingModel, RatchetStepping, STEPPING_MODELS, ravel_state, unravel_state
 from attrs import define, field
 
 
 @define
 class Enigma:
-    plug_board: PlugBoard
+    plug_board: PlugBoard = field(on_setattr=lambda instance, attribute, value: instance._reset_fusion(value))
 
     _rotors: list[Rotor] = field(validator=lambda instance, attribute, value: validate_rotors(value))
     """ Slow rotor first """
 
     memory: deque[list[str]] = field(factory=deque)
-    """ Each keystroke and the corresponding routing is saved here"""
+    """ Each keystroke and the corresponding routing is saved here. Static scramblers are fused, so the routing of a
+    keystroke is: key, entry (plugboard and stators on the fast side, e.g. ETW), each moving rotor from fast to slow,
+    reflector (including stators on the slow side, e.g. the thin rotor of the M4), each moving rotor from slow to fast,
+    entry backwards (= lamp). For three moving rotors these are 10 letters."""
+
+    stepping: SteppingModel = field(
+        factory=RatchetStepping, on_setattr=lambda instance, attribute, value: instance._reset_stepping(value)
+    )
+    """ Decides which rotors move on a keystroke"""
+
+    _successors: tuple[int, ...] | None = field(default=None, init=False, repr=False)
+    """ Following state for each state of the dynamic rotors, compiled from the stepping model"""
+
+    _state: int = field(default=0, init=False, repr=False)
+    _positions: tuple[int, ...] = field(default=(), init=False, repr=False)
+
+    _entry: FusedScrambler | None = field(default=None, init=False, repr=False)
+    """ Plugboard and all stators between plugboard and the rotors (e.g. ETW)"""
+
+    _reflector: FusedScrambler | None = field(default=None, init=False, repr=False)
+    """ Reflector and all stators between reflector and the rotors (e.g. thin rotor of the M4)"""
+
+    _moving_rotors: list[Rotor] = field(factory=list, init=False, repr=False)
+    _static_scramblers: list[Scrambler] = field(factory=list, init=False, repr=False)
+    _fused_version: int = field(default=-1, init=False, repr=False)
 
     @classmethod
     def assemble(
@@ -28,6 +54,7 @@ class Enigma:
         rotor_positions: str = "",
         ring_settings: str | Iterable[int] = "",
         max_memory: int = 100,
+        stepping: str | SteppingModel = "ratchet",
     ) -> Enigma:
         """Assemlbes a new enigma machine
 
@@ -36,6 +63,7 @@ class Enigma:
         :param cables: list of cables for the plugboard, e.g. "AB DF ZK"
         :param rotor_positions: slow rotor first. Use "*" for a stator. Example: "*NAEM"
         :param ring_settings: slow rotor first. Example: "*ABCD". Alternative you can provide a list of numbers with A->1; B->2,...
+        :param stepping: stepping model, e.g. "ratchet" (default) or "cog"
         """
 
         rotors = [Rotor(spec if isinstance(spec, RotorSpec) else WHEEL_SPECS[spec.upper()]) for spec in rotor_specs]
@@ -44,6 +72,7 @@ class Enigma:
             plug_board=PlugBoard(cables),
             rotors=rotors,
             memory=deque([], maxlen=max_memory),
+            stepping=stepping if isinstance(stepping, SteppingModel) else STEPPING_MODELS[stepping.lower()],
         )
 
         if rotor_positions:
@@ -52,6 +81,8 @@ class Enigma:
         if ring_settings:
             enigma.ring_settings = ring_settings
 
+        enigma._fuse_static_scramblers()
+
         return enigma
 
     @property
@@ -97,16 +128,41 @@ class Enigma:
             if rot != "*":
                 whl.ring_setting = rot
 
+    def _fuse_static_scramblers(self):
+        """Fuse contiguous static scramblers into single permutations. This is repeated automatically as soon as one
+        of them is changed (e.g. cables, ring settings)"""
+        rotors = self._rotors
+        dynamic = [i for i, x in enumerate(rotors) if x.spec.is_dynamic]
+        first, last = (dynamic[0], dynamic[-1] + 1) if dynamic else (len(rotors), len(rotors))
+
+        entry = [self.plug_board.route] + [x.route for x in reversed(rotors[last:])]
+        reflector = [x.route for x in reversed(rotors[:first])] + [x.route_backward for x in rotors[1:first]]
+
+        self._entry = FusedScrambler(entry, name="Entry")
+        self._reflector = FusedScrambler(reflector, name="Reflector")
+        self._moving_rotors = rotors[first:last]
+        self._static_scramblers = [self.plug_board] + rotors[:first] + rotors[last:]
+        self._fused_version = self._static_version()
+
+    def _static_version(self) -> int:
+        # noinspection PyProtectedMember
+        return sum(x._version for x in self._static_scramblers)
+
     def _route_scramblers(self) -> Iterable[Callable]:
-        yield self.plug_board.route
+        if self._fused_version != self._static_version():
+            self._fuse_static_scramblers()
+
+        yield self._entry.route
 
-        for wheel in reversed(self.rotors):
+        for wheel in reversed(self._moving_rotors):
             yield wheel.route
 
-        for wheel in self.rotors[1:]:
+        yield self._reflector.route
+
+        for wheel in self._moving_rotors:
             yield wheel.route_backward
 
-        yield self.plug_board.route_backward
+        yield self._entry.route_backward
 
     def _press_key(self, key: str) -> str:
         if key not in ALPHABET:
@@ -127,16 +183,29 @@ class Enigma:
         return _num2letter(routing[-1])
 
     def _rotate(self):
-        rotors = list(reversed(self.dynamic_rotors))
-        do_rotate = {0}  # first Rotor always rotates
+        rotors = self.dynamic_rotors
+        positions = tuple(x.position for x in rotors)
+
+        if self._successors is None:
+            self._successors = self.stepping.successor_tuple([x.spec.notch_numbers for x in rotors])
+
+        # Continue from the current positions, if the rotors were moved by hand
+        if self._positions != positions:
+            self._state = ravel_state(positions)
+
+        self._state = self._successors[self._state]
+        self._positions = unravel_state(self._state, len(rotors))
+        for rotor, before, after in zip(rotors, positions, self._positions):
+            if before != after:
+                rotor.position = after
 
-        for i, (r1, r2) in enumerate(zip(rotors, rotors[1:])):
-            if r1.does_step():
-                do_rotate.add(i)
-                do_rotate.add(i + 1)
+    def _reset_stepping(self, stepping: SteppingModel) -> SteppingModel:
+        self._successors = None
+        return stepping
 
-        for i in do_rotate:
-            rotors[i].position += 1
+    def _reset_fusion(self, plug_board: PlugBoard) -> PlugBoard:
+        self._fused_version = -1
+        return plug_board
 
     def write(self, text: str) -> str:
         input_text = text.upper().replace(" ", "").replace("\n", "")
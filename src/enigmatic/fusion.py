@@ -0,0 +1,42 @@
+"""Fusion of static scramblers
+
+Plugboard, entry wheel, reflector and thin rotors never rotate during encryption. Contiguous static scramblers are
+fused into a single permutation, so a keystroke only has to route through the moving rotors and two fused tables.
+"""
+
+from typing import Callable, Iterable
+
+import numpy as np
+
+from enigmatic import Scrambler, ALPHABET
+
+
+class FusedScrambler(Scrambler):
+    """A fixed permutation, made from a chain of routings through static scramblers
+
+    >>> from enigmatic.plugboard import PlugBoard
+    >>> pb = PlugBoard("AB")
+    >>> FusedScrambler([pb.route, pb.route]).route(0)
+    0
+    """
+
+    _mapping: list[int]
+    _mapping_backward: list[int]
+
+    def __init__(self, routes: Iterable[Callable[[int], int]], name: str = "Fused"):
+        super().__init__(name=name)
+        mapping = list(range(len(ALPHABET)))
+        for route in routes:
+            mapping = [route(x) for x in mapping]
+
+        self._mapping = mapping
+        self._mapping_backward = np.argsort(mapping).tolist()
+
+    def route(self, letter: int) -> int:
+        return self._mapping[letter]
+
+    def route_backward(self, letter: int) -> int:
+        return self._mapping_backward[letter]
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
@@ -68,6 +68,8 @@ class PlugBoard(Scrambler):
             self._mapping[i] = o
             self._mapping[o] = i
 
+        self._changed()
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.cables})"
 
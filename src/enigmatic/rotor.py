@@ -4,11 +4,12 @@ Secodary source: Wikipedia (less precise): https://en.wikipedia.org/wiki/Enigma_
 """
 
 from functools import cached_property
+from typing import Iterable
 
 import numpy as np
 from enigmatic import ALPHABET, ALPHABET_SET, Scrambler, _letters_to_numbers, _num2letter
 from attrs import define, field
-from attrs.setters import frozen
+from attrs.setters import frozen, convert, pipe
 
 
 @define(frozen=True)
@@ -71,6 +72,12 @@ WHEEL_SPECS: dict[str, RotorSpec] = {
 }
 
 
+# noinspection PyProtectedMember
+def _track_change(instance: Scrambler, attribute, value):
+    instance._changed()
+    return value
+
+
 def _ring_settings_converter(position: int | str):
     if isinstance(position, str):
         position = _letters_to_numbers(position)[0] + 1
@@ -87,12 +94,12 @@ class Rotor(Scrambler):
 
     spec: RotorSpec = field(on_setattr=frozen)
 
-    position: int = field(default=0, converter=lambda x: x % len(ALPHABET))
+    position: int = field(default=0, converter=lambda x: x % len(ALPHABET), on_setattr=pipe(convert, _track_change))
     """ Visible letter of the alphabet ring of the rotor trough the window of the enigma machine.
     The letter is represented as a 0-indexed number (A=0) 
     """
 
-    ring_setting: int = field(default=1, converter=_ring_settings_converter)
+    ring_setting: int = field(default=1, converter=_ring_settings_converter, on_setattr=pipe(convert, _track_change))
     """ Changing the position of the ring will change 
     the position of the notch and alphabet, relative to the internal wiring. This setting is called the ring setting
     ring_setting is 1-indexed -> 1==A 
@@ -100,6 +107,8 @@ class Rotor(Scrambler):
 
     _relative_rotation: list[int] = field(init=False, repr=False)
     _relative_rotation_backward: list[int] = field(init=False, repr=False)
+    _wiring: np.ndarray = field(init=False, repr=False, eq=False)
+    _wiring_backward: np.ndarray = field(init=False, repr=False, eq=False)
 
     def __attrs_post_init__(self):
         mapping = _letters_to_numbers(self.spec.wiring)
@@ -107,6 +116,8 @@ class Rotor(Scrambler):
 
         self._relative_rotation = [m - i for i, m in enumerate(mapping)]
         self._relative_rotation_backward = [m - i for i, m in enumerate(sorted_mapping)]
+        self._wiring = np.array(mapping)
+        self._wiring_backward = np.array(sorted_mapping)
 
     def route(self, letter: int) -> int:
         """
@@ -129,6 +140,18 @@ class Rotor(Scrambler):
 
         return output_rotation % len(ALPHABET)
 
+    def route_table(self, positions: Iterable[int] | np.ndarray, backward: bool = False) -> np.ndarray:
+        """Routing of all letters for many rotor positions at once
+
+        Returns an array of shape (number of positions, 26). Row k holds the output letter for each input letter with
+        the rotor at positions[k]. The ring setting of the rotor is used.
+        """
+        wiring = self._wiring_backward if backward else self._wiring
+        rotation = (np.asarray(positions)[:, np.newaxis] - (self.ring_setting - 1)) % len(ALPHABET)
+        input_rotation = (np.arange(len(ALPHABET)) + rotation) % len(ALPHABET)
+
+        return (wiring[input_rotation] - rotation) % len(ALPHABET)
+
     @property
     def rotation_of_wiring(self) -> int:
         """The rotation of the wiring of the rotor is offset by the ring_settings"""
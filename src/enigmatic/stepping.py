@@ -0,0 +1,191 @@
+"""Stepping models
+https://en.wikipedia.org/wiki/Enigma_machine#Stepping
+https://www.cryptomuseum.com/crypto/enigma/g/index.htm
+
+A stepping model describes how the dynamic rotors advance on each keystroke. Every model is compiled into a table
+with the following state for each state of the rotors (states are numbered like a number in base 26, slow rotor
+first). The machine then only looks up the next state on a keystroke, no matter how complicated the stepping
+mechanism is.
+
+SteppingModel.schedule derives the full periodic Schedule from a start state out of the same table. It is not used
+by the machine itself, but is part of the public analysis API: it lists every rotor position of a single key, while
+enigmatic.analysis covers all start states at once.
+"""
+
+from __future__ import annotations
+
+import abc
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+from attrs import define, field
+
+from enigmatic import ALPHABET
+
+
+@define(frozen=True)
+class Schedule:
+    """Rotor positions of the dynamic rotors for each keystroke, slow rotor first
+
+    positions[0] is the start state, positions[k] the state after k keystrokes. From loop_start on, the positions
+    repeat periodically.
+    """
+
+    positions: np.ndarray = field(eq=False, repr=False)
+    loop_start: int = 0
+
+    @property
+    def period(self) -> int:
+        return len(self.positions) - self.loop_start
+
+    def index(self, keystroke: int) -> int:
+        """Row of positions reached after a number of keystrokes"""
+        if keystroke < len(self.positions):
+            return keystroke
+        return self.loop_start + (keystroke - self.loop_start) % self.period
+
+    def __getitem__(self, keystroke: int) -> tuple[int, ...]:
+        return tuple(self.positions[self.index(keystroke)].tolist())
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+@define(frozen=True)
+class SteppingModel(abc.ABC):
+    """A stepping model decides which of the dynamic rotors move when a key is pressed"""
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def step(self, positions: np.ndarray, notches: Sequence[tuple[int, ...]]) -> np.ndarray:
+        """Advance positions by one keystroke
+
+        :param positions: array of shape (..., number of dynamic rotors), slow rotor first
+        :param notches: notch numbers of each dynamic rotor, slow rotor first
+        """
+
+    def successors(self, notches: Sequence[tuple[int, ...]]) -> np.ndarray:
+        """Flat index of the following state for every state of the dynamic rotors"""
+        return _successors(self, tuple(tuple(n) for n in notches))
+
+    def successor_tuple(self, notches: Sequence[tuple[int, ...]]) -> tuple[int, ...]:
+        """Same as successors, but as a tuple of python ints for fast lookup of single states"""
+        return _successor_tuple(self, tuple(tuple(n) for n in notches))
+
+    def schedule(self, notches: Sequence[tuple[int, ...]], start: Sequence[int]) -> Schedule:
+        """Compile the full periodic schedule, starting at the given rotor positions (slow rotor first)"""
+        if not start:
+            return Schedule(np.zeros((1, 0), dtype=np.uint8))
+
+        shape = (len(ALPHABET),) * len(start)
+        successors = self.successor_tuple(notches)
+
+        state = ravel_state(start)
+        seen: dict[int, int] = {}
+        order: list[int] = []
+        while state not in seen:
+            seen[state] = len(order)
+            order.append(state)
+            state = successors[state]
+
+        positions = np.array(np.unravel_index(order, shape), dtype=np.uint8).T
+        return Schedule(positions, seen[state])
+
+
+def ravel_state(positions: Sequence[int]) -> int:
+    """Number of the state of the dynamic rotors, slow rotor first
+
+    >>> ravel_state((0, 1, 2))
+    28
+    """
+    state = 0
+    for position in positions:
+        state = state * len(ALPHABET) + position
+    return state
+
+
+def unravel_state(state: int, n_rotors: int) -> tuple[int, ...]:
+    """Positions of the dynamic rotors, slow rotor first
+
+    >>> unravel_state(28, 3)
+    (0, 1, 2)
+    """
+    positions = [0] * n_rotors
+    for i in reversed(range(n_rotors)):
+        state, positions[i] = divmod(state, len(ALPHABET))
+    return tuple(positions)
+
+
+@lru_cache(maxsize=32)
+def _successor_tuple(model: SteppingModel, notches: tuple[tuple[int, ...], ...]) -> tuple[int, ...]:
+    return tuple(_successors(model, notches).tolist())
+
+
+@lru_cache(maxsize=32)
+def _successors(model: SteppingModel, notches: tuple[tuple[int, ...], ...]) -> np.ndarray:
+    if not notches:
+        return np.zeros(1, dtype=np.intp)
+
+    shape = (len(ALPHABET),) * len(notches)
+    states = np.indices(shape).reshape(len(shape), -1).T
+    following = model.step(states, notches) % len(ALPHABET)
+
+    successors = np.ravel_multi_index(tuple(following.T), shape)
+    successors.flags.writeable = False
+    return successors
+
+
+def _at_notch(positions: np.ndarray, notches: Sequence[tuple[int, ...]]) -> np.ndarray:
+    at_notch = np.zeros(positions.shape, dtype=bool)
+    for i, notch in enumerate(notches):
+        at_notch[..., i] = np.isin(positions[..., i], notch)
+    return at_notch
+
+
+@define(frozen=True)
+class RatchetStepping(SteppingModel):
+    """Pawl and ratchet stepping of the military Enigma, including the double step
+    https://de.wikipedia.org/wiki/Enigma_(Maschine)#Anomalie
+
+    Rotors with several notches (VI, VII, VIII or the Typex rotors) are covered by this model as well.
+    """
+
+    name: str = "ratchet"
+
+    def step(self, positions: np.ndarray, notches: Sequence[tuple[int, ...]]) -> np.ndarray:
+        steps = np.zeros(positions.shape, dtype=bool)
+        steps[..., -1:] = True  # fast rotor always rotates
+
+        # A rotor at its notch lets the pawl of its left neighbour engage: both rotors step
+        pushes = _at_notch(positions, notches)[..., 1:]
+        steps[..., :-1] |= pushes
+        steps[..., 1:] |= pushes
+
+        return positions + steps
+
+
+@define(frozen=True)
+class CogStepping(SteppingModel):
+    """Gear driven stepping like an odometer, as used by the Enigma G (Abwehr Enigma). There is no double step:
+    a rotor only moves when all faster rotors pass their notches
+
+    Only the rotors are modelled. The stepping reflector of the Enigma G is not supported, because the reflector of
+    a machine has to be a stator (see validate_rotors).
+    """
+
+    name: str = "cog"
+
+    def step(self, positions: np.ndarray, notches: Sequence[tuple[int, ...]]) -> np.ndarray:
+        at_notch = _at_notch(positions, notches)
+
+        steps = np.zeros(positions.shape, dtype=bool)
+        steps[..., -1:] = True
+        for i in reversed(range(positions.shape[-1] - 1)):
+            steps[..., i] = steps[..., i + 1] & at_notch[..., i + 1]
+
+        return positions + steps
+
+
+STEPPING_MODELS: dict[str, SteppingModel] = {model.name: model for model in [RatchetStepping(), CogStepping()]}
@@ -0,0 +1,149 @@
+"""Persistent store of composed rotor core tables
+
+The rotor core is the reflector together with all wheels up to the fast rotor (e.g. thin rotor and the three moving
+rotors of the M4). For each rotation of these wheels, the core table holds the permutation of a letter entering and
+leaving the core. Since the table is indexed by the rotation of the wiring (position and ring setting combined), one
+table per wheel order serves all ring settings.
+
+Tables are generated once, saved as .npy files and memory-mapped read-only, so many processes share the same pages
+without copying. File names contain a hash of the wirings, tables for changed wheel specs are never mixed up. If the
+store grows beyond its size budget, the least recently used tables are removed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from attrs import define, field
+
+from enigmatic import ALPHABET
+from enigmatic.enigma import Enigma
+from enigmatic.rotor import Rotor, RotorSpec, WHEEL_SPECS
+
+FORMAT_VERSION = 1
+
+DEFAULT_DIRECTORY = Path(os.environ.get("ENIGMATIC_TABLES", Path.home() / ".cache" / "enigmatic"))
+
+
+@define
+class TableStore:
+    """Store of core tables on disk"""
+
+    directory: Path = field(default=DEFAULT_DIRECTORY, converter=Path)
+    max_bytes: int = 1 << 30
+    """ Size budget of all tables in the store"""
+
+    def core_table(self, rotor_specs: Iterable[str | RotorSpec]) -> np.ndarray:
+        """Memory-mapped core table. It is generated and saved if it does not exist yet.
+
+        :param rotor_specs: wheel specs of the core, reflector first, fast rotor last
+        :return: read only array with one axis for the rotation of each wheel after the reflector and a last axis for
+            the input letter
+        """
+        specs = [spec if isinstance(spec, RotorSpec) else WHEEL_SPECS[spec.upper()] for spec in rotor_specs]
+        path = self.path(specs)
+
+        # Other processes may evict the table at any time, a missing file is just a cache miss
+        try:
+            table = np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            table = core_table(specs)
+            self._save(path, table)
+            self.evict(keep=path)
+            try:
+                table = np.load(path, mmap_mode="r")
+            except FileNotFoundError:
+                table.flags.writeable = False
+
+        self._touch(path)
+        return table
+
+    def path(self, specs: list[RotorSpec]) -> Path:
+        content = "|".join(f"{x.name}:{x.wiring}" for x in specs) + f"|{FORMAT_VERSION}"
+        digest = hashlib.sha1(content.encode()).hexdigest()[:12]
+        name = "-".join(re.sub(r"\W+", "_", x.name) for x in specs)
+
+        return self.directory / f"{name}-{digest}.npy"
+
+    def evict(self, keep: Path | None = None):
+        """Remove the least recently used tables, until the store is within its size budget"""
+        files = []
+        for file in self.directory.glob("*.npy"):
+            try:
+                files.append((file.stat(), file))
+            except FileNotFoundError:
+                continue  # removed by another process
+
+        files.sort(key=lambda x: x[0].st_mtime)
+        size = sum(stat.st_size for stat, _ in files)
+
+        for stat, file in files:
+            if size <= self.max_bytes:
+                break
+            if file == keep:
+                continue
+
+            size -= stat.st_size
+            file.unlink(missing_ok=True)
+
+    def _save(self, path: Path, table: np.ndarray):
+        # Write to a temporary file first, so other processes never see a half written table
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                np.save(stream, table)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _touch(path: Path):
+        """Mark the table as recently used. Best effort, e.g. the store may be a read-only shared directory"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def core_table(specs: list[RotorSpec]) -> np.ndarray:
+    """Generate the table for a core: reflector first, fast rotor last"""
+    rotors = [Rotor(spec) for spec in specs]
+    shape = (len(ALPHABET),) * (len(rotors) - 1)
+
+    rotations = np.indices(shape).reshape(len(shape), -1)[:, :, np.newaxis]
+    all_rotations = range(len(ALPHABET))
+    current = np.broadcast_to(np.arange(len(ALPHABET)), (rotations.shape[1], len(ALPHABET)))
+
+    for rotor, rotation in zip(reversed(rotors[1:]), reversed(rotations)):
+        current = rotor.route_table(all_rotations)[rotation, current]
+
+    current = rotors[0].route_table([0])[0][current]
+
+    for rotor, rotation in zip(rotors[1:], rotations):
+        current = rotor.route_table(all_rotations, backward=True)[rotation, current]
+
+    return current.astype(np.uint8).reshape(shape + (len(ALPHABET),))
+
+
+def core_rotors(enigma: Enigma) -> list[Rotor]:
+    """Reflector and all wheels up to the fast rotor of the machine"""
+    rotors = enigma.rotors
+    last = max((i for i, x in enumerate(rotors) if x.spec.is_dynamic), default=len(rotors) - 1)
+    return rotors[: last + 1]
+
+
+def core_rotations(enigma: Enigma) -> tuple[int, ...]:
+    """Index into the core table for the current state of the machine"""
+    reflector, *rotors = core_rotors(enigma)
+    if reflector.rotation_of_wiring != 0:
+        raise ValueError("Core tables require a reflector in its basic position")
+
+    return tuple(x.rotation_of_wiring for x in rotors)
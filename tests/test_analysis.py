@@ -0,0 +1,68 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from rich.console import Console
+
+from enigmatic import ALPHABET, _letters_to_numbers
+from enigmatic.analysis import analyse, analyse_wheel_orders, state_permutations, summary_table, M3_WHEEL_ORDERS
+from enigmatic.enigma import Enigma
+
+console = Console(legacy_windows=False, color_system="truecolor", style="Black on bright_white")
+console.size = (200, 50)
+
+
+@pytest.mark.parametrize(
+    "wheels,expected_period",
+    [(["ukw-b", "III", "II", "I"], 26 * 25 * 26), (["ukw-b", "III", "II", "VI"], 8450)],
+)
+def test_period(wheels, expected_period):
+    stat = analyse(Enigma.assemble(wheels))
+    console.print(stat)
+
+    assert stat.period[0, 0, 0] == expected_period
+    assert stat.visited[0, 0, 0] == expected_period
+
+
+def test_statistics_match_typing():
+    enigma = Enigma.assemble(["ukw-b", "III", "II", "VI"], cables="AB CD", ring_settings="*CDE")
+    stat = analyse(enigma)
+    period = stat.period[0, 0, 0]
+
+    states = []
+    for _ in range(period):
+        enigma.write("X")
+        states.append(enigma.rotor_positions[1:])
+
+    cycle = stat.cycle[tuple(_letters_to_numbers(states[0]))]
+    for i, positions in enumerate(zip(*states)):
+        count = Counter(_letters_to_numbers(positions))
+        assert stat.position_histogram[cycle, i].tolist() == [count[x] for x in range(len(ALPHABET))]
+
+
+def test_state_permutations():
+    enigma = Enigma.assemble(["ukw-c", "beta", "V", "VI", "VIII"], cables="AE BF CM", ring_settings="*EPEL")
+    enigma.rotor_positions = "*CDSZ"
+    positions = [[x.position for x in enigma.dynamic_rotors]]
+
+    permutation = state_permutations(enigma, np.array(positions))[0]
+    assert permutation.tolist() == [_route(enigma, x) for x in range(len(ALPHABET))]
+
+
+def _route(enigma: Enigma, letter: int) -> int:
+    for route in enigma._route_scramblers():
+        letter = route(letter)
+    return letter
+
+
+def test_never_to_itself():
+    for stat in analyse_wheel_orders(M3_WHEEL_ORDERS[:3]):
+        assert not np.diagonal(stat.output_distribution, axis1=1, axis2=2).any()
+
+
+def test_all_m3_wheel_orders():
+    statistics = analyse_wheel_orders()
+    console.print(summary_table(statistics))
+
+    assert len(statistics) == 60
+    assert all(stat.states_on_cycles == 26 * 25 * 26 for stat in statistics)
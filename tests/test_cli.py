@@ -0,0 +1,56 @@
+import json
+
+from enigmatic.cli import main
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(x) + "\n" for x in records))
+
+
+def test_cli_messages(tmp_path):
+    key_sheet = tmp_path / "key_sheet.json"
+    key_sheet.write_text(json.dumps({"rotor_specs": ["ukw-b", "beta", "V", "VI", "VIII"], "ring_settings": "*AAEL"}))
+
+    messages = tmp_path / "messages.jsonl"
+    _write_jsonl(
+        messages,
+        [
+            {"id": "0", "text": "Hello World", "rotor_positions": "*SCHL"},
+            {"id": "1", "text": "invalid!"},
+            {"id": "2", "text": 123},
+            {"id": "3", "text": "HELLO", "ring_settings": 5},
+        ],
+    )
+    with open(messages, "a") as stream:
+        stream.write("{no json\n")
+        stream.write('{"id": "5", "text": "Hello World", "rotor_positions": "*SCHL"}\n')
+
+    output = tmp_path / "output.jsonl"
+    exit_code = main(
+        [str(key_sheet), str(messages), "-o", str(output), "-w", "2", "--cables", "AE BF CM DQ HU JN LX PR SZ VW"]
+    )
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert exit_code == 1
+    assert results[0] == {"id": "0", "output": "GBAKITMLDZ"}
+    assert [x["id"] for x in results] == ["0", "1", "2", "3", None, "5"]
+    assert all("error" in x for x in results[1:5])
+    assert "line 5" in results[4]["error"]
+    assert results[5] == {"id": "5", "output": "GBAKITMLDZ"}
+
+
+def test_cli_directory(tmp_path):
+    key_sheet = tmp_path / "key_sheet.json"
+    key_sheet.write_text(json.dumps({"rotor_specs": ["ukw-b", "I", "II", "III"], "comment": "daily key"}))
+
+    messages = tmp_path / "messages"
+    messages.mkdir()
+    for i in range(5):
+        (messages / f"msg_{i}.txt").write_text("XXXX XXXX\n")
+
+    output = tmp_path / "output.jsonl"
+    assert main([str(key_sheet), str(messages), "-o", str(output), "--window", "2"]) == 0
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [x["id"] for x in results] == [f"msg_{i}" for i in range(5)]
+    assert len({x["output"] for x in results}) == 1
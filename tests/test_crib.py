@@ -0,0 +1,46 @@
+import random
+
+import numpy as np
+
+from enigmatic import ALPHABET
+from enigmatic.crib import admissible_offsets, crib_placements
+from enigmatic.enigma import Enigma
+
+
+def test_crib_in_message():
+    enigma = Enigma.assemble(["ukw-b", "II", "IV", "I"], cables="AB CD", rotor_positions="*QRS")
+    plaintext = "XXXXVONOBERKOMMANDODERWEHRMACHTXXXXWETTERBERICHT"
+    ciphertext = enigma.write(plaintext)
+
+    offsets = admissible_offsets(ciphertext, "WETTERBERICHT")
+    assert plaintext.index("WETTERBERICHT") in offsets.tolist()
+
+    placements = crib_placements(ciphertext, ["WETTER", "WETTERBERICHT"], expected_offsets=[-1])
+    assert placements[0].crib == "WETTERBERICHT"
+    assert placements[0].offset == len(plaintext) - len("WETTERBERICHT")
+
+
+def test_compare_with_loop():
+    rng = random.Random(0)
+    ciphertext = "".join(rng.choices(ALPHABET, k=2000))
+    crib = "".join(rng.choices(ALPHABET, k=12))
+
+    expected = [
+        offset
+        for offset in range(len(ciphertext) - len(crib) + 1)
+        if all(c != p for c, p in zip(ciphertext[offset:], crib))
+    ]
+    assert admissible_offsets(ciphertext, crib).tolist() == expected
+
+
+def test_crib_longer_than_ciphertext():
+    assert crib_placements("ABC", "ABCD") == []
+
+
+def test_megabyte_ciphertext():
+    ciphertext = np.random.default_rng(0).integers(len(ALPHABET), size=1_000_000, dtype=np.uint8)
+    ciphertext = (ciphertext + ord("A")).tobytes().decode()
+    offsets = admissible_offsets(ciphertext, "OBERKOMMANDODERWEHRMACHT")
+
+    # on average (25/26)**24 of all offsets are admissible
+    assert 0.35 < len(offsets) / len(ciphertext) < 0.42
@@ -9,6 +9,7 @@ import plotext as plt
 import yaml
 from collections import Counter
 
+from enigmatic.plugboard import PlugBoard
 from enigmatic.rotor import RotorSpec
 
 # console
@@ -124,6 +125,28 @@ def test_enigma_typing():
     console.print(enigma.memory)
 
 
+def test_static_scramblers_are_fused_again():
+    """Changing cables, ring settings or the position of a static wheel after assembly"""
+    settings = dict(rotor_specs=["ukw-b", "beta", "V", "VI", "VIII"], rotor_positions="*SCHL")
+    expected = Enigma.assemble(**settings, cables="AE BF", ring_settings="*CAEL").write("HELLOWORLD")
+
+    enigma = Enigma.assemble(**settings)
+    assert len(list(enigma._route_scramblers())) == 9  # entry, 3 rotors, reflector, 3 rotors, entry
+
+    enigma.write("X")
+    assert len(enigma.memory[-1]) == 10  # key and the output of each routing step
+    assert enigma.memory[-1][0] == "X"
+    enigma.rotor_positions = "*SCHL"
+
+    enigma.plug_board.add_cables("AE BF")
+    enigma.ring_settings = "*CAEL"
+    assert enigma.write("HELLOWORLD") == expected
+
+    enigma.plug_board = PlugBoard()
+    enigma.rotor_positions = "*SCHL"
+    assert enigma.write("HELLOWORLD") == Enigma.assemble(**settings, ring_settings="*CAEL").write("HELLOWORLD")
+
+
 def load_testdata(schema):
     source = Path(r"test_messages")
     data = []
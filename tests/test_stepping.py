@@ -0,0 +1,51 @@
+import pytest
+
+from enigmatic.enigma import Enigma
+from enigmatic.rotor import WHEEL_SPECS
+from enigmatic.stepping import RatchetStepping, CogStepping
+
+
+def _notches(*wheels):
+    return [WHEEL_SPECS[w].notch_numbers for w in wheels]
+
+
+@pytest.mark.parametrize(
+    "wheels,expected_period",
+    [(["III", "II", "I"], 26 * 25 * 26), (["III", "II", "VI"], 8450)],
+)
+def test_ratchet_period(wheels, expected_period):
+    schedule = RatchetStepping().schedule(_notches(*wheels), (0, 0, 0))
+    assert schedule.period == expected_period
+
+
+def test_ratchet_double_step():
+    # Rotor II is at its notch (E) only for one keystroke, then rotor I and II step together
+    schedule = RatchetStepping().schedule(_notches("I", "II", "III"), (0, 3, 20))
+    assert [schedule[i] for i in range(4)] == [(0, 3, 20), (0, 3, 21), (0, 4, 22), (1, 5, 23)]
+
+
+def test_schedule_transient():
+    # The middle rotor at its notch with the fast rotor at "A" can not be reached by stepping
+    schedule = RatchetStepping().schedule(_notches("I", "II", "III"), (0, 4, 0))
+    assert schedule.loop_start == 1
+    assert schedule[schedule.loop_start + schedule.period] == schedule[schedule.loop_start]
+
+
+def test_cog_period():
+    schedule = CogStepping().schedule(_notches("III", "II", "I"), (0, 0, 0))
+    assert schedule.period == 26**3
+
+
+def test_manual_positions_continue_stepping():
+    enigma = Enigma.assemble(["ukw-b", "I", "II", "III"])
+    enigma.write("XXXX")
+
+    enigma.rotor_positions = "*ADU"
+    enigma.write("XXX")
+    assert enigma.rotor_positions == "ABFX"
+
+
+def test_stepping_by_name():
+    enigma = Enigma.assemble(["ukw-b", "I", "II", "III"], rotor_positions="*ADU", stepping="cog")
+    enigma.write("XXX")
+    assert enigma.rotor_positions == "AAEX"  # no double step
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+
+from enigmatic import ALPHABET
+from enigmatic.analysis import state_permutations
+from enigmatic.enigma import Enigma
+from enigmatic.rotor import RotorSpec, WHEEL_SPECS
+from enigmatic.tables import TableStore, core_rotors, core_rotations
+
+
+def test_core_table_matches_enigma(tmp_path):
+    enigma = Enigma.assemble(["ukw-c", "beta", "V", "VI", "VIII"], rotor_positions="*CDSZ", ring_settings="*EPEL")
+    table = TableStore(tmp_path).core_table([x.spec for x in core_rotors(enigma)])
+    assert table.shape == (26, 26, 26, 26, 26)
+
+    for _ in range(30):
+        enigma.write("X")
+        positions = [[x.position for x in enigma.dynamic_rotors]]
+        expected = state_permutations(enigma, np.array(positions))[0]
+
+        assert table[core_rotations(enigma)].tolist() == expected.tolist()
+
+
+def test_tables_are_memory_mapped(tmp_path):
+    store = TableStore(tmp_path)
+    store.core_table(["ukw-b", "I", "II", "III"])
+    table = store.core_table(["ukw-b", "I", "II", "III"])
+
+    assert isinstance(table, np.memmap)
+    assert not table.flags.writeable
+
+
+def test_versioned_by_wiring(tmp_path):
+    store = TableStore(tmp_path)
+    enigma = Enigma.assemble(["ukw-b", "I", "II", "III"])
+    specs = [x.spec for x in enigma.rotors]
+    changed = [specs[0], specs[1], specs[2], RotorSpec("III", "".join(ALPHABET[1:] + ALPHABET[:1]), "V")]
+
+    assert store.path(specs) != store.path(changed)
+
+
+def test_evicted_table_is_generated_again(tmp_path):
+    store = TableStore(tmp_path)
+    expected = np.array(store.core_table(["ukw-b", "I", "II", "III"]))
+
+    for file in tmp_path.glob("*.npy"):
+        file.unlink()  # e.g. evicted by another process
+
+    assert np.array_equal(store.core_table(["ukw-b", "I", "II", "III"]), expected)
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    store = TableStore(tmp_path)
+
+    def use(wheels: list[str], mtime: int):
+        # explicit access times, the file system may not resolve consecutive touches
+        store.core_table(wheels)
+        os.utime(store.path([WHEEL_SPECS[x.upper()] for x in wheels]), (mtime, mtime))
+
+    use(["ukw-b", "I", "II", "III"], 1000)
+    table_size = next(tmp_path.glob("*.npy")).stat().st_size
+
+    # room for two tables, but not for three
+    store.max_bytes = int(2.5 * table_size)
+    use(["ukw-b", "II", "III", "I"], 1001)
+    use(["ukw-b", "I", "II", "III"], 1002)
+    use(["ukw-b", "III", "I", "II"], 1003)
+
+    names = sorted(x.name.rsplit("-", 1)[0] for x in tmp_path.glob("*.npy"))
+    assert names == ["UKW_B-I-II-III", "UKW_B-III-I-II"]